@@ -0,0 +1,306 @@
+"""
+Draft-night load simulation.
+
+Seeds a synthetic pool (entrants x --picks predictions drawn from
+PLAYER_NAME_SUGGESTIONS, split into --rounds rounds), then replays a scripted draft: the admin posts
+/update_pick every --pick-interval seconds while --viewers poll / and
+--late-entrants keep posting /submit_picks. Reports p50/p95/p99 latency,
+throughput and SQL queries per request for each route.
+
+    python bench.py --entrants 2000 --viewers 20 --late-entrants 4 --duration 30
+    python bench.py --entrants 2000 --picks 257 --rounds 7
+    python bench.py --entrants 2000 --picks 257 --score-rules
+
+--score-rules skips the load test and instead times one whole-pool
+rescore pass under each scoring rule on a synthetic prediction matrix.
+
+By default everything runs in-process against a throwaway SQLite file.
+Point DATABASE_URL at another (empty) database to seed it instead, and
+pass --url to drive a running server that uses that database. Query
+counts come from /metrics, so against gunicorn they only cover the
+worker that answered the final scrape.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+if 'DATABASE_URL' not in os.environ:
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='draft-bench-'), 'bench.db')
+
+draft = None  # the app module, imported in main() once the environment is set
+ADMIN_KEY = 'analytics'
+SCORE_RULE_SPECS = ['exact', 'flat:10', 'window:2:3', 'position:1', 'upset:10',
+                    'exact+window:2:3+position:1+upset:10']
+_METRIC_RE = re.compile(r'^(\w+)\{(.*)\} ([0-9.eE+-]+)$')
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """Minimal client for a running server; redirects are reported, not followed."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(_NoRedirect)
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(req) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+class InProcessClient:
+    """Flask test client with the same interface as HttpClient."""
+
+    def __init__(self):
+        self.client = draft.app.test_client()
+
+    def request(self, method, path, data=None):
+        resp = self.client.open(path, method=method, data=data)
+        return resp.status_code, resp.data
+
+
+class Recorder:
+    """Collects (route, latency, ok) samples from all simulation threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def timed(self, client, route, method, path, data=None):
+        start = time.perf_counter()
+        status, _ = client.request(method, path, data)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.samples.setdefault(route, []).append(elapsed)
+            if status >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+        return status
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[idx]
+
+
+def scrape_counters(client):
+    """Parse per-route request/query counters and scoring timings out of /metrics."""
+    _, body = client.request('GET', '/metrics?key=' + ADMIN_KEY)
+    queries, requests, scoring = {}, {}, {}
+    for line in body.decode().splitlines():
+        match = _METRIC_RE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.group(1), dict(_LABEL_RE.findall(match.group(2))), float(match.group(3))
+        route = labels.get('route')
+        if name == 'draft_db_queries_total':
+            queries[route] = queries.get(route, 0) + value
+        elif name == 'draft_http_requests_total':
+            requests[route] = requests.get(route, 0) + value
+        elif name in ('draft_scoring_duration_seconds_count', 'draft_scoring_duration_seconds_sum'):
+            totals = scoring.setdefault(labels.get('operation'), [0, 0.0])
+            totals[0 if name.endswith('_count') else 1] += value
+    return queries, requests, scoring
+
+
+def synthetic_board(num_players):
+    """Write a PLAYER_NAMES_FILE big enough for a draft longer than the built-in board."""
+    path = os.path.join(tempfile.mkdtemp(prefix='draft-bench-players-'), 'players.txt')
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.writelines(f'Prospect {i:04d}\n' for i in range(1, num_players + 1))
+    return path
+
+
+def seed(entrants, seed_value, picks, rounds):
+    """Seed the default pool, or a new pool when --picks/--rounds ask for another layout."""
+    with draft.app.app_context():
+        draft.ensure_schema()
+        if draft.Entrant.query.first() is not None:
+            sys.exit("Refusing to seed: the target database already has entrants.")
+        pool_id = draft.DEFAULT_POOL_ID
+        if picks:
+            layout = draft.DraftLayout.even(picks, rounds)
+            pool_id = draft.create_pool('Bench', round_sizes=str(layout))
+        draft.g.pool_id = pool_id
+        start = time.perf_counter()
+        draft.seed_synthetic_pool(entrants, num_actual_picks=0, seed=seed_value)
+        return pool_id, draft.draft_layout(), time.perf_counter() - start
+
+
+def run_draft(make_client, recorder, args, pool_id, num_picks):
+    """Replay the scripted draft; returns the wall-clock duration."""
+    stop = threading.Event()
+    rng = random.Random(args.seed)
+    draft_order = rng.sample(draft.PLAYER_NAME_SUGGESTIONS, num_picks)
+    query = '' if pool_id == draft.DEFAULT_POOL_ID else f'?pool={pool_id}'
+
+    def admin():
+        client = make_client()
+        for pick_number, player in enumerate(draft_order, start=1):
+            if stop.is_set():
+                return
+            recorder.timed(client, '/update_pick', 'POST', '/update_pick' + query,
+                           {'key': ADMIN_KEY, 'pick_number': str(pick_number), 'player_name': player})
+            stop.wait(args.pick_interval)
+
+    def viewer():
+        client = make_client()
+        while not stop.is_set():
+            recorder.timed(client, '/', 'GET', '/' + query)
+            stop.wait(args.think_time)
+
+    def late_entrant(worker):
+        client = make_client()
+        local_rng = random.Random(args.seed * 1000 + worker)
+        n = 0
+        while not stop.is_set():
+            n += 1
+            players = local_rng.sample(draft.PLAYER_NAME_SUGGESTIONS, num_picks)
+            form = {'entrant_name': f'Late Entrant {worker}-{n}', 'team_name': f'Late Team {worker}-{n}',
+                    'tiebreaker_guess': str(local_rng.randint(0, 10))}
+            form.update({f'pick_{i}': p for i, p in enumerate(players, start=1)})
+            recorder.timed(client, '/submit_picks', 'POST', '/submit_picks' + query, form)
+            stop.wait(args.submit_interval)
+
+    threads = [threading.Thread(target=admin)]
+    threads += [threading.Thread(target=viewer) for _ in range(args.viewers)]
+    threads += [threading.Thread(target=late_entrant, args=(i,)) for i in range(args.late_entrants)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    stop.wait(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def summarize(recorder, duration, queries, requests):
+    results = {}
+    for route, samples in sorted(recorder.samples.items()):
+        samples = sorted(samples)
+        served = requests.get(route, 0)
+        results[route] = {
+            'requests': len(samples),
+            'errors': recorder.errors.get(route, 0),
+            'throughput_rps': len(samples) / duration if duration else 0.0,
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p95_ms': percentile(samples, 95) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+            'queries_per_request': (queries.get(route, 0) / served) if served else None,
+        }
+    return results
+
+
+def print_report(results, duration, seed_seconds, args, layout):
+    print(f"pool: {args.entrants} entrants x {layout.num_picks} picks in {len(layout.round_sizes)} rounds "
+          f"(seeded in {seed_seconds:.2f}s)")
+    print(f"load: {args.viewers} viewers, {args.late_entrants} late entrants, "
+          f"pick every {args.pick_interval}s, {duration:.1f}s wall clock\n")
+    print(f"{'route':<16}{'reqs':>7}{'err':>5}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}")
+    for route, r in results.items():
+        qpr = f"{r['queries_per_request']:.1f}" if r['queries_per_request'] is not None else '-'
+        print(f"{route:<16}{r['requests']:>7}{r['errors']:>5}{r['throughput_rps']:>9.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{qpr:>8}")
+
+
+def bench_score_rules(args):
+    """Time a whole-pool scoring pass per rule set: half the draft made, every entrant predicting every pick."""
+    num_picks = args.picks or draft.pool_directory.layout(draft.DEFAULT_POOL_ID).num_picks
+    players = [""] + list(draft.PLAYER_NAME_SUGGESTIONS)
+    ctx = draft.scoring_context(players)
+    rng = np.random.default_rng(args.seed)
+    predicted = (np.argsort(rng.random((args.entrants, len(players) - 1)), axis=1)[:, :num_picks] + 1).astype(np.int16)
+    actual = (rng.permutation(len(players) - 1)[:num_picks] + 1).astype(np.int16)
+    actual[num_picks // 2:] = 0
+
+    print(f"pool: {args.entrants} entrants x {num_picks} picks, {num_picks // 2} picks made\n")
+    print(f"{'rules':<40}{'ms/pass':>10}{'ns/cell':>10}{'sql':>6}")
+    for spec in SCORE_RULE_SPECS:
+        rules = draft.ScoringRules.parse(spec)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            rules.totals(predicted, actual, ctx)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        sql = rules.sql_points(draft.Prediction.pick_number == 0, draft.Prediction.pick_number, num_picks) is not None
+        print(f"{spec:<40}{best * 1000:>10.2f}{best * 1e9 / predicted.size:>10.2f}{'yes' if sql else 'no':>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entrants', type=int, default=500, help='synthetic entrants to seed')
+    parser.add_argument('--viewers', type=int, default=10, help='threads polling /')
+    parser.add_argument('--late-entrants', type=int, default=2, help='threads posting /submit_picks')
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds to run the draft')
+    parser.add_argument('--pick-interval', type=float, default=1.0, help='seconds between admin picks')
+    parser.add_argument('--think-time', type=float, default=0.0, help='viewer pause between refreshes')
+    parser.add_argument('--submit-interval', type=float, default=0.5, help='late entrant pause between posts')
+    parser.add_argument('--picks', type=int, default=0, help='draft length (default: the default pool layout)')
+    parser.add_argument('--rounds', type=int, default=1, help='rounds to split --picks into')
+    parser.add_argument('--score-rules', action='store_true', help='benchmark each scoring rule and exit')
+    parser.add_argument('--repeat', type=int, default=20, help='--score-rules passes per rule (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='RNG seed for the pool and the draft')
+    parser.add_argument('--url', help='drive a running server instead of the in-process app')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    global draft
+    if args.picks > 0 and 'PLAYER_NAMES_FILE' not in os.environ:
+        os.environ['PLAYER_NAMES_FILE'] = synthetic_board(args.picks * 2)
+    import app as draft  # DATABASE_URL and PLAYER_NAMES_FILE must be set first
+
+    if args.score_rules:
+        bench_score_rules(args)
+        return
+    pool_id, layout, seed_seconds = seed(args.entrants, args.seed, args.picks, args.rounds)
+    if args.url:
+        make_client = lambda: HttpClient(args.url)  # noqa: E731
+    else:
+        make_client = InProcessClient
+
+    recorder = Recorder()
+    before = scrape_counters(make_client())
+    duration = run_draft(make_client, recorder, args, pool_id, layout.num_picks)
+    if not args.url:
+        draft.rescore_worker.wait_idle(timeout=60)
+    after = scrape_counters(make_client())
+    queries = {r: after[0].get(r, 0) - before[0].get(r, 0) for r in after[0]}
+    requests = {r: after[1].get(r, 0) - before[1].get(r, 0) for r in after[1]}
+    rescores = [after[2].get('rescore', [0, 0.0])[i] - before[2].get('rescore', [0, 0.0])[i] for i in (0, 1)]
+
+    results = summarize(recorder, duration, queries, requests)
+    print_report(results, duration, seed_seconds, args, layout)
+    writes = sum(r['requests'] for route, r in results.items() if route != '/')
+    print(f"\nrescores: {int(rescores[0])} for {writes} writes, {rescores[1] * 1000:.0f} ms total")
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump({'args': vars(args), 'duration_s': duration, 'routes': results,
+                       'rescores': {'count': rescores[0], 'seconds': rescores[1]}}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
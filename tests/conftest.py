@@ -0,0 +1,79 @@
+"""
+Shared fixtures: one throwaway SQLite database per test session.
+
+The default pool is seeded once with synthetic entrants and actual picks;
+tests that write get a fresh pool of their own (`pool`), since every pool
+has its own versions, matrix, snapshot and caches. Requests rescore inline
+so a response is only returned once its scores are written, and a route
+that breaks its QUERY_BUDGETS entry raises QueryBudgetExceeded.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix='draft-tests-')
+os.environ.update({
+    'DATABASE_URL': 'sqlite:///' + os.path.join(_TMP, 'draft.db'),
+    'STANDINGS_SNAPSHOT_DIR': _TMP,
+    'PROFILE_DIR': os.path.join(_TMP, 'profiles'),
+    'RESCORE_MODE': 'inline',
+    'QUERY_BUDGET_MODE': 'raise',
+})
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as draft  # noqa: E402  (reads the environment above)
+
+ADMIN = {'key': 'analytics'}
+SEEDED_ENTRANTS = 50
+SEEDED_PICKS = 10
+
+
+@pytest.fixture(scope='session')
+def seeded():
+    """The default pool seeded with synthetic entrants, warmed up like a worker before it takes traffic."""
+    draft.app.config['TESTING'] = True
+    with draft.app.app_context():
+        draft.ensure_schema()
+        draft.seed_synthetic_pool(SEEDED_ENTRANTS, num_actual_picks=SEEDED_PICKS)
+    assert draft.warm_up.run()
+    return draft
+
+
+@pytest.fixture
+def client(seeded):
+    return draft.app.test_client()
+
+
+@pytest.fixture
+def pool(seeded):
+    """A new, empty pool (default layout and scoring rules); returns its id."""
+    with draft.app.app_context():
+        return draft.create_pool('Test Pool')
+
+
+def send(client, method, path, data=None):
+    """Make one request; returns (response, statements counted against the route's budget)."""
+    with client:
+        response = client.open(path, method=method, data=data)
+        return response, draft.g.perf['budgeted_queries']
+
+
+def budget(path, method='GET'):
+    """The QUERY_BUDGETS entry of the route `path` resolves to."""
+    rule, _ = draft.app.url_map.bind('localhost').match(path.split('?')[0], method=method, return_rule=True)
+    return draft.QUERY_BUDGETS[rule.rule]
+
+
+def picks_form(players, **fields):
+    """An entry form predicting `players` for picks 1, 2, ..."""
+    return {**fields, **{f'pick_{pn}': player for pn, player in enumerate(players, start=1)}}
+
+
+def in_pool(pool_id, fn, *args, **kwargs):
+    """Run `fn` in an app context scoped to `pool_id` (as a request with ?pool= would be)."""
+    with draft.app.app_context():
+        draft.g.pool_id = pool_id
+        return fn(*args, **kwargs)
@@ -0,0 +1,68 @@
+"""The pick event log: replayed standings match the live scoreboard, and history has a point per pick."""
+from conftest import ADMIN, draft, in_pool, picks_form
+
+PLAYERS = draft.PLAYER_NAME_SUGGESTIONS
+
+
+def submit(client, pool_id, name, players, tiebreaker):
+    form = picks_form(players, entrant_name=name, team_name=f'{name} Team', tiebreaker_guess=str(tiebreaker))
+    assert client.post(f'/submit_picks?pool={pool_id}', data=form).status_code == 302
+
+
+def live_standings(pool_id):
+    return in_pool(pool_id, lambda: [
+        (row.name, row.total_score, row.rank)
+        for row in draft.db.session.execute(draft.ranked_standings_query(pool_id))])
+
+
+def standings_as_of(client, pool_id, event_id=''):
+    data = client.get(f'/standings_as_of?key=analytics&pool={pool_id}&event_id={event_id}').get_json()
+    return [(row['name'], row['total_score'], row['rank']) for row in data['standings']]
+
+
+def test_replay_matches_the_live_scoreboard(client, pool):
+    # Alice and Bob tie on points; Carl has not predicted anything yet.
+    submit(client, pool, 'Alice', PLAYERS[:32], tiebreaker=9)
+    submit(client, pool, 'Bob', [PLAYERS[0], *PLAYERS[40:71]], tiebreaker=5)
+    submit(client, pool, 'Carl', [], tiebreaker=1)
+    client.post(f'/update_pick?pool={pool}', data={**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]})
+
+    live = live_standings(pool)
+    assert [score for _, score, _ in live] == [live[0][1], live[0][1], 0]
+    assert [rank for _, _, rank in live] == [1, 1, 3]
+    assert standings_as_of(client, pool) == live
+
+    client.post(f'/update_actual_tiebreaker?pool={pool}', data={**ADMIN, 'actual_tiebreaker': '4'})
+    live = live_standings(pool)
+    assert [(name, rank) for name, _, rank in live] == [('Bob', 1), ('Alice', 2), ('Carl', 3)]
+    assert standings_as_of(client, pool) == live
+
+
+def test_replay_as_of_an_earlier_event(client, pool):
+    submit(client, pool, 'Alice', PLAYERS[:32], tiebreaker=1)
+    client.post(f'/update_pick?pool={pool}', data={**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]})
+    event_id = in_pool(pool, lambda: draft.db.session.execute(
+        draft.select(draft.func.max(draft.DraftEvent.event_id)).where(draft.DraftEvent.pool_id == pool)).scalar())
+    client.post(f'/update_pick?pool={pool}', data={**ADMIN, 'pick_number': '2', 'player_name': PLAYERS[1]})
+
+    earlier = client.get(f'/standings_as_of?key=analytics&pool={pool}&event_id={event_id}').get_json()
+    assert earlier['actual_picks'] == {'1': PLAYERS[0]}
+    assert standings_as_of(client, pool, event_id)[0][1] < live_standings(pool)[0][1]
+
+
+def test_background_rescoring_records_history_per_pick(client, pool, monkeypatch):
+    submit(client, pool, 'Alice', PLAYERS[:32], tiebreaker=1)
+    submit(client, pool, 'Bob', PLAYERS[32:64], tiebreaker=2)
+    monkeypatch.setitem(draft.app.config, 'RESCORE_MODE', 'background')
+    # Holding the rescore lock makes the worker coalesce the picks that arrive meanwhile into one batch.
+    with draft.app.app_context(), draft.rescore_lock(pool):
+        for pick_number, player in enumerate([PLAYERS[0], PLAYERS[33], PLAYERS[2]], start=1):
+            client.post(f'/update_pick?pool={pool}',
+                        data={**ADMIN, 'pick_number': str(pick_number), 'player_name': player})
+    assert draft.rescore_worker.wait_idle(timeout=10)
+
+    points = in_pool(pool, lambda: draft.db.session.execute(
+        draft.select(draft.StandingsHistory.picks_made, draft.func.count())
+        .where(draft.StandingsHistory.pool_id == pool)
+        .group_by(draft.StandingsHistory.picks_made).order_by(draft.StandingsHistory.picks_made)).all())
+    assert [tuple(point) for point in points] == [(1, 2), (2, 2), (3, 2)]
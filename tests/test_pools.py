@@ -0,0 +1,95 @@
+"""Pools: each request only sees and writes its own pool, and a pool's status gates its writes."""
+from conftest import ADMIN, draft, in_pool, picks_form
+
+PLAYERS = draft.PLAYER_NAME_SUGGESTIONS
+
+
+def submit(client, pool_id, name, players, tiebreaker='1'):
+    form = picks_form(players, entrant_name=name, team_name=f'{name} Team', tiebreaker_guess=tiebreaker)
+    return client.post(f'/submit_picks?pool={pool_id}', data=form)
+
+
+def entrant_id(pool_id, name):
+    return in_pool(pool_id, lambda: draft.db.session.execute(
+        draft.select(draft.Entrant.entrant_id)
+        .where(draft.Entrant.pool_id == pool_id, draft.Entrant.name == name)).scalar())
+
+
+def prediction_count(pool_id, entrant_id):
+    return in_pool(pool_id, lambda: draft.Prediction.query.filter_by(pool_id=pool_id, entrant_id=entrant_id).count())
+
+
+def status(pool_id):
+    return in_pool(pool_id, lambda: draft.db.session.get(draft.DraftState, pool_id).status)
+
+
+def test_same_name_in_two_pools_is_two_entrants(client, seeded):
+    with draft.app.app_context():
+        first, second = draft.create_pool('First'), draft.create_pool('Second')
+    submit(client, first, 'Ann', PLAYERS[:32])
+    submit(client, second, 'Ann', PLAYERS[32:64])
+    ids = [entrant_id(first, 'Ann'), entrant_id(second, 'Ann')]
+    assert ids[0] != ids[1]
+
+    client.post(f'/update_pick?pool={first}', data={**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]})
+    with draft.app.app_context():
+        scores = dict(draft.db.session.execute(
+            draft.select(draft.EntrantStanding.pool_id, draft.EntrantStanding.total_score)
+            .where(draft.EntrantStanding.entrant_id.in_(ids))).all())
+    assert scores[first] > 0 and not scores.get(second)
+
+
+def test_standings_list_only_the_pools_entrants(client, pool):
+    submit(client, pool, 'Only Here', PLAYERS[:32])
+    page = client.get(f'/?pool={pool}').get_data(as_text=True)
+    assert 'Only Here' in page and 'Entrant 1' not in page
+    assert 'Only Here' not in client.get('/').get_data(as_text=True)
+
+
+def test_another_pools_entrant_cannot_be_deleted_or_edited(client, pool):
+    submit(client, pool, 'Ann', PLAYERS[:32])
+    ann = entrant_id(pool, 'Ann')
+
+    client.post('/delete_team', data={**ADMIN, 'entrant_id': str(ann)})  # default pool's URL
+    assert entrant_id(pool, 'Ann') == ann
+    assert prediction_count(pool, ann) == 32
+
+    assert 'Ann Team' in client.get(f'/edit_team/{ann}?key=analytics&pool={pool}').get_data(as_text=True)
+    assert 'Ann Team' not in client.get(f'/edit_team/{ann}?key=analytics').get_data(as_text=True)
+
+
+def test_locked_pool_rejects_entries_but_takes_results(client, pool):
+    submit(client, pool, 'Ann', PLAYERS[:32])
+    ann = entrant_id(pool, 'Ann')
+    client.post(f'/set_pool_status?pool={pool}', data={**ADMIN, 'status': 'locked'})
+    assert status(pool) == draft.POOL_LOCKED
+
+    response = submit(client, pool, 'Late', PLAYERS[:32])
+    assert response.status_code == 302 and '/enter_picks' in response.location
+    assert entrant_id(pool, 'Late') is None
+
+    reversed_picks = picks_form(PLAYERS[:32][::-1], **ADMIN)
+    client.post(f'/save_team/{ann}?key=analytics&pool={pool}', data=reversed_picks)
+    predicted = in_pool(pool, lambda: draft.db.session.execute(
+        draft.select(draft.Prediction.predicted_player_name)
+        .where(draft.Prediction.entrant_id == ann, draft.Prediction.pick_number == 1)).scalar())
+    assert predicted == PLAYERS[0]
+
+    client.post(f'/update_pick?pool={pool}', data={**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]})
+    assert in_pool(pool, lambda: draft.db.session.get(draft.ActualPick, (pool, 1))).player_name == PLAYERS[0]
+
+
+def test_final_pool_rejects_everything(client, pool):
+    submit(client, pool, 'Ann', PLAYERS[:32])
+    client.post(f'/set_pool_status?pool={pool}', data={**ADMIN, 'status': 'locked'})
+    client.post(f'/set_pool_status?pool={pool}', data={**ADMIN, 'status': 'final'})
+    assert status(pool) == draft.POOL_FINAL
+    version = in_pool(pool, lambda: draft.db.session.get(draft.DraftState, pool).data_version)
+
+    client.post(f'/update_pick?pool={pool}', data={**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]})
+    client.post(f'/update_actual_tiebreaker?pool={pool}', data={**ADMIN, 'actual_tiebreaker': '3'})
+    client.post(f'/set_pool_status?pool={pool}', data={**ADMIN, 'status': 'open'})
+
+    state = in_pool(pool, lambda: draft.db.session.get(draft.DraftState, pool))
+    assert (state.status, state.data_version, state.actual_tiebreaker) == (draft.POOL_FINAL, version, None)
+    assert in_pool(pool, lambda: draft.db.session.get(draft.ActualPick, (pool, 1))) is None
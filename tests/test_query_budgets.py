@@ -0,0 +1,216 @@
+"""
+Every budgeted route within its QUERY_BUDGETS entry, with the response and
+the rows it wrote checked too: a request that fails fast is not a pass.
+"""
+import pytest
+
+from conftest import ADMIN, SEEDED_PICKS, budget, draft, in_pool, picks_form, send
+
+PLAYERS = draft.PLAYER_NAME_SUGGESTIONS
+NUM_PICKS = 32
+
+
+def within_budget(client, method, path, data=None, status=200):
+    response, queries = send(client, method, path, data)
+    assert response.status_code == status, response.data[:500]
+    assert queries <= budget(path, method), f"{method} {path} ran {queries} queries"
+    return response
+
+
+def entrant(pool_id, name):
+    return in_pool(pool_id, lambda: draft.Entrant.query.filter_by(pool_id=pool_id, name=name).one_or_none())
+
+
+def predictions(pool_id, entrant_id):
+    return in_pool(pool_id, lambda: {
+        p.pick_number: p.predicted_player_name
+        for p in draft.Prediction.query.filter_by(pool_id=pool_id, entrant_id=entrant_id)})
+
+
+def actual_picks(pool_id):
+    return in_pool(pool_id, lambda: {
+        p.pick_number: p.player_name for p in draft.ActualPick.query.filter_by(pool_id=pool_id)})
+
+
+def total_score(pool_id, entrant_id):
+    return in_pool(pool_id, lambda: draft.db.session.execute(
+        draft.select(draft.EntrantStanding.total_score)
+        .where(draft.EntrantStanding.entrant_id == entrant_id)).scalar() or 0)
+
+
+def pool_state(pool_id):
+    return in_pool(pool_id, lambda: draft.db.session.get(draft.DraftState, pool_id))
+
+
+@pytest.mark.parametrize('path', [
+    '/',
+    '/admin?key=analytics',
+    '/enter_picks',
+    '/team_select?key=analytics',
+    '/team_select?key=analytics&q=team%201',
+    '/team_select?key=analytics&after_name=entrant%2020&after_id=20',
+    '/edit_team/2?key=analytics',
+    '/export_data?key=analytics',
+    '/standings_as_of?key=analytics&event_id=3',
+    '/win_probabilities?sims=1000&key=analytics',
+    '/standings_history',
+    '/standings_history?entrant_id=2',
+    '/standings_history/movers',
+    '/metrics?key=analytics',
+])
+def test_read_pages(client, path):
+    within_budget(client, 'GET', path)
+
+
+def test_edit_team_by_team_name_redirects_to_the_entrant(client):
+    response = within_budget(client, 'GET', '/edit_team/Team 2?key=analytics', status=302)
+    assert '/edit_team/2' in response.location
+
+
+def test_standings_rebuild_after_a_pick(client, pool):
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                  picks_form(PLAYERS[:NUM_PICKS], entrant_name='Ann', team_name='A', tiebreaker_guess='1'),
+                  status=302)
+    within_budget(client, 'POST', f'/update_pick?pool={pool}',
+                  {**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]}, status=302)
+    page = within_budget(client, 'GET', f'/?pool={pool}').data.decode()
+    assert 'Ann' in page and PLAYERS[0] in page
+
+
+def test_submit_picks(client, pool):
+    form = picks_form(PLAYERS[:NUM_PICKS], entrant_name='Ann', team_name='A', tiebreaker_guess='2')
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}', form, status=302)
+    ann = entrant(pool, 'Ann')
+    assert ann.tiebreaker_guess == 2
+    assert predictions(pool, ann.entrant_id) == dict(enumerate(PLAYERS[:NUM_PICKS], start=1))
+
+    # Resubmitted with a new tiebreaker and two picks swapped.
+    swapped = [PLAYERS[1], PLAYERS[0], *PLAYERS[2:NUM_PICKS]]
+    form = picks_form(swapped, entrant_name='Ann', team_name='A', tiebreaker_guess='3')
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}', form, status=302)
+    assert entrant(pool, 'Ann').tiebreaker_guess == 3
+    assert predictions(pool, ann.entrant_id)[1] == PLAYERS[1]
+
+    version = pool_state(pool).data_version
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}', form, status=302)
+    assert pool_state(pool).data_version == version  # unchanged: nothing written
+
+
+def test_update_pick_scores(client, pool):
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                  picks_form(PLAYERS[:NUM_PICKS], entrant_name='Ann', team_name='A', tiebreaker_guess='1'),
+                  status=302)
+    ann = entrant(pool, 'Ann').entrant_id
+    within_budget(client, 'POST', f'/update_pick?pool={pool}',
+                  {**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]}, status=302)
+    assert actual_picks(pool) == {1: PLAYERS[0]}
+    assert total_score(pool, ann) > 0
+
+    within_budget(client, 'POST', f'/delete_pick?pool={pool}', {**ADMIN, 'pick_number': '1'}, status=302)
+    assert actual_picks(pool) == {}
+    assert total_score(pool, ann) == 0
+
+
+def test_update_picks(client, pool):
+    lines = "\n".join(f"{pn}, {PLAYERS[pn - 1]}" for pn in range(1, 11))
+    within_budget(client, 'POST', f'/update_picks?pool={pool}',
+                  {**ADMIN, 'pick_lines': lines, 'replace_all': '1'}, status=302)
+    assert actual_picks(pool) == dict(enumerate(PLAYERS[:10], start=1))
+
+
+def test_tiebreakers(client, pool):
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                  picks_form(PLAYERS[:NUM_PICKS], entrant_name='Ann', team_name='A', tiebreaker_guess='1'),
+                  status=302)
+    ann = entrant(pool, 'Ann').entrant_id
+    within_budget(client, 'POST', f'/update_tiebreaker?pool={pool}',
+                  {**ADMIN, 'entrant_id': str(ann), 'tiebreaker_guess': '4'}, status=302)
+    assert entrant(pool, 'Ann').tiebreaker_guess == 4
+    within_budget(client, 'POST', f'/update_actual_tiebreaker?pool={pool}',
+                  {**ADMIN, 'actual_tiebreaker': '5'}, status=302)
+    assert pool_state(pool).actual_tiebreaker == 5
+
+
+def test_save_team(client, pool):
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                  picks_form(PLAYERS[:NUM_PICKS], entrant_name='Ann', team_name='A', tiebreaker_guess='1'),
+                  status=302)
+    ann = entrant(pool, 'Ann').entrant_id
+    within_budget(client, 'GET', f'/edit_team/{ann}?key=analytics&pool={pool}')
+    reversed_picks = PLAYERS[:NUM_PICKS][::-1]
+    within_budget(client, 'POST', f'/save_team/{ann}?key=analytics&pool={pool}',
+                  picks_form(reversed_picks, **ADMIN), status=302)
+    assert predictions(pool, ann) == dict(enumerate(reversed_picks, start=1))
+
+
+def test_delete_team(client, pool):
+    for name in ('Ann', 'Bob'):
+        within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                      picks_form(PLAYERS[:NUM_PICKS], entrant_name=name, team_name=name, tiebreaker_guess='1'),
+                      status=302)
+    ann = entrant(pool, 'Ann').entrant_id
+    within_budget(client, 'POST', f'/delete_team?pool={pool}', {**ADMIN, 'entrant_id': str(ann)}, status=302)
+    assert entrant(pool, 'Ann') is None
+    assert predictions(pool, ann) == {}
+    assert entrant(pool, 'Bob') is not None
+
+
+def test_create_pool(client, seeded):
+    within_budget(client, 'POST', '/create_pool',
+                  {**ADMIN, 'pool_name': 'Budget Pool', 'season': '2026', 'round_sizes': '16,16'}, status=302)
+    pool = in_pool(draft.DEFAULT_POOL_ID, lambda: draft.Pool.query.filter_by(name='Budget Pool').one())
+    assert (pool.season, pool.round_sizes) == (2026, '16,16')
+    assert pool_state(pool.pool_id).status == draft.POOL_OPEN
+    within_budget(client, 'GET', f'/?pool={pool.pool_id}')
+
+
+def test_matrix_rules(client, seeded):
+    """Rules that need the prediction matrix rescore outside the request, so their budgets are the same."""
+    with draft.app.app_context():
+        pool = draft.create_pool('Rules Pool', rules='exact+window:2:3+position:1')
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                  picks_form(PLAYERS[:NUM_PICKS], entrant_name='Ann', team_name='A', tiebreaker_guess='2'),
+                  status=302)
+    ann = entrant(pool, 'Ann').entrant_id
+    within_budget(client, 'POST', f'/update_pick?pool={pool}',
+                  {**ADMIN, 'pick_number': '2', 'player_name': PLAYERS[0]}, status=302)
+    assert total_score(pool, ann) > 0  # a window hit: pick 1's player taken at 2
+    lines = "\n".join(f"{pn}, {PLAYERS[pn - 1]}" for pn in range(1, 11))
+    within_budget(client, 'POST', f'/update_picks?pool={pool}',
+                  {**ADMIN, 'pick_lines': lines, 'replace_all': '1'}, status=302)
+    within_budget(client, 'POST', f'/save_team/{ann}?key=analytics&pool={pool}',
+                  picks_form(PLAYERS[:NUM_PICKS][::-1], **ADMIN), status=302)
+    within_budget(client, 'POST', f'/delete_pick?pool={pool}', {**ADMIN, 'pick_number': '2'}, status=302)
+    assert 2 not in actual_picks(pool)
+    within_budget(client, 'GET', f'/?pool={pool}')
+
+
+def test_locked_and_final_pool(client, pool):
+    within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                  picks_form(PLAYERS[:NUM_PICKS], entrant_name='Ann', team_name='A', tiebreaker_guess='1'),
+                  status=302)
+    within_budget(client, 'POST', f'/set_pool_status?pool={pool}', {**ADMIN, 'status': 'locked'}, status=302)
+    assert pool_state(pool).status == draft.POOL_LOCKED
+    within_budget(client, 'GET', f'/enter_picks?pool={pool}')
+
+    response = within_budget(client, 'POST', f'/submit_picks?pool={pool}',
+                             picks_form(PLAYERS[:NUM_PICKS], entrant_name='Late', team_name='L',
+                                        tiebreaker_guess='1'), status=302)
+    assert '/enter_picks' in response.location
+    assert entrant(pool, 'Late') is None
+
+    within_budget(client, 'POST', f'/update_pick?pool={pool}',
+                  {**ADMIN, 'pick_number': '1', 'player_name': PLAYERS[0]}, status=302)
+    assert actual_picks(pool) == {1: PLAYERS[0]}
+    within_budget(client, 'GET', f'/?pool={pool}')
+
+    within_budget(client, 'POST', f'/set_pool_status?pool={pool}', {**ADMIN, 'status': 'final'}, status=302)
+    assert pool_state(pool).status == draft.POOL_FINAL
+    within_budget(client, 'GET', f'/?pool={pool}')
+
+
+def test_seeded_pool_is_scored(client):
+    """The seeding the read-page budgets run against: entrants with scores over SEEDED_PICKS picks."""
+    assert len(actual_picks(draft.DEFAULT_POOL_ID)) == SEEDED_PICKS
+    page = within_budget(client, 'GET', '/').data.decode()
+    assert 'Entrant 1' in page
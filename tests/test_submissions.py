@@ -0,0 +1,66 @@
+"""Idempotent entry and edit forms: a replayed token gets the first submission's redirect and writes nothing."""
+import re
+
+from conftest import ADMIN, draft, in_pool, picks_form
+
+PLAYERS = draft.PLAYER_NAME_SUGGESTIONS
+_TOKEN_RE = re.compile(r'name="idempotency_token" value="([^"]+)"')
+
+
+def form_token(client, path):
+    return _TOKEN_RE.search(client.get(path).get_data(as_text=True)).group(1)
+
+
+def data_version(pool_id):
+    return in_pool(pool_id, lambda: draft.db.session.get(draft.DraftState, pool_id).data_version)
+
+
+def entrant_count(pool_id, name):
+    return in_pool(pool_id, lambda: draft.Entrant.query.filter_by(pool_id=pool_id, name=name).count())
+
+
+def test_replayed_entry_is_written_once(client, pool):
+    token = form_token(client, f'/enter_picks?pool={pool}')
+    assert token != form_token(client, f'/enter_picks?pool={pool}')
+    form = picks_form(PLAYERS[:32], entrant_name='Ann', team_name='A', tiebreaker_guess='2', idempotency_token=token)
+
+    first = client.post(f'/submit_picks?pool={pool}', data=form)
+    version = data_version(pool)
+    replay = client.post(f'/submit_picks?pool={pool}', data={**form, 'tiebreaker_guess': '7'})
+
+    assert (first.status_code, replay.status_code) == (302, 302)
+    assert replay.location == first.location
+    assert data_version(pool) == version
+    assert entrant_count(pool, 'Ann') == 1
+    assert in_pool(pool, lambda: draft.Entrant.query.filter_by(pool_id=pool, name='Ann').one().tiebreaker_guess) == 2
+
+
+def test_rejected_entry_releases_its_token(client, pool):
+    token = form_token(client, f'/enter_picks?pool={pool}')
+    form = picks_form(PLAYERS[:32], entrant_name='Ann', team_name='A', tiebreaker_guess='x', idempotency_token=token)
+
+    invalid = client.post(f'/submit_picks?pool={pool}', data=form)
+    assert invalid.status_code == 200 and token not in invalid.get_data(as_text=True)
+    assert entrant_count(pool, 'Ann') == 0
+
+    fixed = client.post(f'/submit_picks?pool={pool}', data={**form, 'tiebreaker_guess': '2'})
+    assert fixed.status_code == 302
+    assert entrant_count(pool, 'Ann') == 1
+
+
+def test_replayed_edit_is_written_once(client, pool):
+    client.post(f'/submit_picks?pool={pool}',
+                data=picks_form(PLAYERS[:32], entrant_name='Ann', team_name='A', tiebreaker_guess='2'))
+    ann = in_pool(pool, lambda: draft.Entrant.query.filter_by(pool_id=pool, name='Ann').one().entrant_id)
+    token = form_token(client, f'/edit_team/{ann}?key=analytics&pool={pool}')
+    form = picks_form(PLAYERS[:32][::-1], **ADMIN, idempotency_token=token)
+
+    first = client.post(f'/save_team/{ann}?key=analytics&pool={pool}', data=form)
+    version = data_version(pool)
+    replay = client.post(f'/save_team/{ann}?key=analytics&pool={pool}', data={**form, 'pick_1': PLAYERS[100]})
+
+    assert replay.location == first.location
+    assert data_version(pool) == version
+    pick_1 = in_pool(pool, lambda: draft.Prediction.query.filter_by(
+        pool_id=pool, entrant_id=ann, pick_number=1).one().predicted_player_name)
+    assert pick_1 == PLAYERS[31]